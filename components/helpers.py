@@ -135,11 +135,10 @@ def move_object_to_locator(locators: list[pm.nt.Transform]) -> list[pm.nt.Transf
         list[pm.nt.Transform]: List of original transform nodes moved to the locators' positions.
     """
     original_objects = []
-    locators = sorted(locators, key=lambda loc: pm.PyNode(loc.attr(ATTR_ID).get()).name(long=True))
-    for template in locators:
-        original_object = get_original_transform(template)
-        if not original_object: continue
-        
+    # Resolve each original once and move parents before their children.
+    pairs = [(get_original_transform(template), template) for template in locators]
+    pairs = sorted(((obj.longName(), obj, template) for obj, template in pairs if obj), key=lambda item: item[0])
+    for _, original_object, template in pairs:
         position = template.getTranslation(ws=True)
         original_object.setTranslation(position, ws=True)
 
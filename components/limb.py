@@ -18,7 +18,6 @@ TODO: IMPLEMENT.
 import pymel.core as pm
 import chisel_rigging.framework.framework as framework
 import chisel_rigging.framework.control_framework as control_lib
-import utility.maya_lib as maya_lib
 from components.ribbon import Ribbon
 
 
@@ -44,32 +43,30 @@ class FK(Limb):
     def create_controls(self, references: pm.nt.Transform, normal: control_lib.Vector, use_offset: bool) -> list[control_lib.Control]:
         control_suffix = "_ctrl"
 
-        # Sort objects by hierarchy depth.
-        objects = sorted(references, key= lambda obj: obj.name(long=True))
+        # Sort objects by hierarchy depth, keeping each long name for the ancestry test and the control names.
+        pairs = sorted(((obj.longName(), obj) for obj in references), key=lambda pair: pair[0])
+        long_names = [long_name for long_name, _ in pairs]
+        objects = [obj for _, obj in pairs]
+        controls = []
 
-        for obj_index in range(len(objects)):
-            obj = objects[obj_index]
+        for obj_index, obj in enumerate(objects):
+            long_name = long_names[obj_index]
 
             # Control creation.
-            control_name = f"{obj}{control_suffix}"
+            control_name = long_name.rsplit("|", 1)[-1] + control_suffix
             control = control_lib.Circle()
             control.create(name=control_name, normal=normal)
             control.align_to(obj)
+            controls.append(control)
 
-            # Parent control to the previous one in the hierarchy.
-            if obj_index > 0:
-                parent_object_name = f"{objects[obj_index-1]}"
-                parent_object = pm.nt.Transform(parent_object_name)
-                if not maya_lib.is_ancestor(parent_object, obj):
-                    continue
-                
-                control.parent_to(parent_object_name)
-                parent_control = f"{objects[obj_index-1]}{control_suffix}"
-                pm.parent(control.transform, parent_control)
+            # Parent control to the previous one in the hierarchy. Sorted long names make the prefix test exact.
+            if obj_index > 0 and long_name.startswith(long_names[obj_index-1] + "|"):
+                control.parent_to(controls[obj_index-1].transform)
             
             # Optional offset group.
             if use_offset:
                 control.create_offset("_offset")
+        return controls
 
     def build(self):
         controls = []
@@ -76,11 +76,16 @@ class Control():
 
     def __init__(self, control_name= "_"):
         if pm.objExists(control_name):
-            self.transform = pm.nt.Transform(control_name)
-            self._name = self.transform.name()
+            self.bind(control_name)
         else:
             self.transform = None
             self._name = control_name or "control"
+
+    def bind(self, transform_node: pm.nt.Transform) -> 'Control':
+        """Point the instance to an existing transform, to reuse one wrapper across many controls."""
+        self.transform = pm.nt.Transform(transform_node)
+        self._name = self.transform.name()
+        return self
             
 
     def __str__(self):
@@ -196,16 +201,21 @@ class Control():
 
     def _create_curve_from_json(self, shape_name: str):
         self.transform = pm.nt.Transform(n=self.name)
-        pm.delete(self.shapes)
+        if self.shapes:
+            pm.delete(self.shapes)
 
         shape_points = SHAPE_LIBRARY[shape_name]
+        curves = []
         for index, points in shape_points.items():
             curve = pm.curve(d=1, p=points, n=f"{self.name}_{shape_name}")
             closed = pm.closeCurve(curve, preserveShape=True, ch=False, rpo=True)[0]
             
             self.shapes = closed.getShape()
-            pm.delete(curve)
-        
+            curves.append(curve)
+
+        # The emptied curve transforms are removed together once every shape is moved.
+        if curves:
+            pm.delete(curves)
         return self
 
     def _store_curve_to_json(self, shape_name: str):
@@ -235,20 +245,31 @@ class Control():
         self.shape_orient([0, -90 * normal[2], 90 * normal[1]])
         return self
 
-    def shape_replace(self, *new_curves: pm.nt.Transform) -> 'Control':
+    def shape_replace(self, *new_curves: pm.nt.Transform, delete_source=False) -> 'Control':
         old_shapes = self.shapes
-        self.shape_combine(*new_curves)
-        pm.delete(old_shapes)
+        source_curves = self._combine_curves(new_curves)
+        # Emptied sources go in the same delete as the replaced shapes.
+        to_delete = old_shapes + source_curves if delete_source else old_shapes
+        if to_delete:
+            pm.delete(to_delete)
         return self
 
-    def shape_combine(self, *new_curves: pm.nt.Transform) -> 'Control':
+    def shape_combine(self, *new_curves: pm.nt.Transform, delete_source=False) -> 'Control':
+        source_curves = self._combine_curves(new_curves)
+        if delete_source and source_curves:
+            pm.delete(source_curves)
+        return self
+
+    def _combine_curves(self, new_curves) -> list[pm.nt.Transform]:
+        """Move the shapes of the given curves, nested lists included, under the control. Returns the source curves."""
+        source_curves = []
         for curve in new_curves:
             if isinstance(curve, (list, tuple)):
-                self.shape_combine(*curve)
+                source_curves.extend(self._combine_curves(curve))
                 continue
             self.shapes = curve.getShapes()
-
-        return self
+            source_curves.append(curve)
+        return source_curves
     
     def shape_color_index(self, color: ColorIndex) -> 'Control':
         """
@@ -1,16 +1,14 @@
 
 
 import os
-from functools import partial
 
+import maya.cmds as cmds
 import pymel.core as pm
 import maya.OpenMayaUI as omui
 from maya.app.general.mayaMixin import MayaQWidgetDockableMixin
 from shiboken2 import wrapInstance
 
 import chisel_rigging.components.helpers as helpers
-import chisel_rigging.components.ribbon as ribbon
-import chisel_rigging.components.squash_stretch as ss
 import chisel_rigging.framework.control_framework as ctrl_lib
 import chisel_rigging.utility.common as common
 import chisel_rigging.utility.maya_lib as maya_lib
@@ -115,78 +113,156 @@ def showUI():
         _CHISEL_UI_INSTANCE.raise_()
 
 
-class MainController:
-    def __init__(self, view):
+def get_view_buttons(view) -> dict:
+    """Map the object name of every button in the view to its widget, to look them up in a single pass."""
+    return {button.objectName(): button for button in view.findChildren(QtWidgets.QAbstractButton)}
+
+
+class SignalThrottle(QtCore.QObject):
+    """Coalesce the signals received within interval milliseconds into a single call of function.
+    With pass_count, function receives how many signals were coalesced."""
+
+    def __init__(self, function, interval=50, pass_count=False, parent=None):
+        super().__init__(parent)
+        self._function = function
+        self._pass_count = pass_count
+        self._count = 0
+        self._timer = QtCore.QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(interval)
+        self._timer.timeout.connect(self._flush)
+
+    @QtCore.Slot()
+    def trigger(self):
+        self._count += 1
+        if not self._timer.isActive():
+            self._timer.start()
+
+    @QtCore.Slot()
+    def _flush(self):
+        count, self._count = self._count, 0
+        if self._pass_count:
+            self._function(count)
+        else:
+            self._function()
+
+
+class ViewController:
+    """Base of the tab controllers, connects the view buttons listed in BUTTON_CONNECTIONS to their slots."""
+    # Button name and slot name. Built once per class, bound per instance in bind_view.
+    BUTTON_CONNECTIONS = ()
+
+    def __init__(self, view, buttons: dict=None):
         self.view = view
-        
-        self.controls   = ControlsController(self.view)  # Control related functions.
-        self.edit       = EditController(self.view)      # Edit or general related functions.
-        self.component  = ComponentController(self.view) # Rig component related functions.
-        self.surgery    = SurgeryController(self.view)   # Surgery related functions.
-        self.filter     = FilterController(self.view)    # Filtering related functions.
+        self.missing_buttons = self.bind_view(get_view_buttons(view) if buttons is None else buttons)
+
+    def bind_view(self, buttons: dict) -> list[str]:
+        """Connect the listed buttons found in the buttons map. Returns the names of the missing ones."""
+        missing_buttons = []
+        for button_name, method_name in self.BUTTON_CONNECTIONS:
+            button = buttons.get(button_name)
+            if button is None:
+                missing_buttons.append(button_name)
+                continue
+            button.clicked.connect(getattr(self, method_name))
+        return missing_buttons
 
-class ControlsController:
+
+class MainController:
     def __init__(self, view):
         self.view = view
-        self.bind_view()
-
-    def bind_view(self):
+        buttons = get_view_buttons(self.view) # Shared by every controller, the view is only walked once.
         
-        connections = {
-            # Control functions
-            "btnCircle":     partial(self.press_create_control,ctrl_lib.Shapes.CIRCLE),
-            "btnSquare":     partial(self.press_create_control,ctrl_lib.Shapes.SQUARE),
-            "btnTriangle":   partial(self.press_create_control,ctrl_lib.Shapes.TRIANGLE),
-
-            "btnArrow":      partial(self.press_create_control,ctrl_lib.Shapes.ARROW),
-            "btnPin":        partial(self.press_create_control,ctrl_lib.Shapes.PIN),
-            "btnCross":      partial(self.press_create_control,ctrl_lib.Shapes.CROSS),
-
-            "btnCubeCN":     partial(self.press_create_control,ctrl_lib.Shapes.CUBE_CN),
-            "btnCubeFk":     partial(self.press_create_control,ctrl_lib.Shapes.CUBE_FK),
-            "btnSphere":     partial(self.press_create_control,ctrl_lib.Shapes.SPHERE),
-            "btnOrient":     partial(self.press_create_control,ctrl_lib.Shapes.ORIENT_3D),
-            "btnButton":     partial(self.press_create_control,ctrl_lib.Shapes.BUTTON),
-            "btnRing":       partial(self.press_create_control,ctrl_lib.Shapes.RING),
-            "btnButton":     partial(self.press_create_control,ctrl_lib.Shapes.BUTTON),
-            "btnControlText":partial(self.press_create_control,ctrl_lib.Shapes.TEXT),
-            "btnSlider":     partial(self.press_create_control,ctrl_lib.Shapes.SLIDER),
-            "btnOsipa":      partial(self.press_create_control,ctrl_lib.Shapes.OSIPA),
-            "btnSemiCircle": partial(self.press_create_control,ctrl_lib.Shapes.SEMI_CIRCLE),
-
-            "BtnShapeOperationReplace": self.control_shape_replace,
-            "BtnShapeOperarionCombine": self.control_shape_add,
-            "BtnShapeOperationSwap":    self.control_shape_swap,
-            "BtnShapeOperationCopy":    self.control_shape_copy,
-            "BtnShapeOpereationMirror": self.control_shape_mirror,
-            "BtnShapeResizePlus":       self.control_shape_size_down,
-            "BtnShapeResizeMinus":      self.control_shape_size_up,
-            "BtnShapeThick":            self.control_shape_thicken,
-            "BtnShapeThin":             self.control_shape_thin,
-            "BtnResetControl":          self.reset_controls,
-
-            "BtnShapeColorRed":     partial(self.control_shape_color_index, ctrl_lib.ColorIndex.RED),
-            "BtnShapeColorYellow":  partial(self.control_shape_color_index, ctrl_lib.ColorIndex.YELLOW),
-            "BtnShapeColorBlue":    partial(self.control_shape_color_index, ctrl_lib.ColorIndex.BLUE),
-            "BtnShapeColorPurple":  partial(self.control_shape_color_index, ctrl_lib.ColorIndex.PURPLE),
-            "BtnShapeColorGreen":   partial(self.control_shape_color_index, ctrl_lib.ColorIndex.GREEN),
-        }
-
-        for button_name, method in connections.items():
-            button = getattr(self.view, button_name, None)
-            if button:
-                button.clicked.connect(method)
-            else:
-                pm.warning(f"Button '{button_name}' not found in the view. Connection skipped.")
+        self.controls   = ControlsController(self.view, buttons)  # Control related functions.
+        self.edit       = EditController(self.view, buttons)      # Edit or general related functions.
+        self.component  = ComponentController(self.view, buttons) # Rig component related functions.
+        self.surgery    = SurgeryController(self.view, buttons)   # Surgery related functions.
+        self.filter     = FilterController(self.view, buttons)    # Filtering related functions.
+
+        controllers = (self.controls, self.edit, self.component, self.surgery, self.filter)
+        missing_buttons = [name for controller in controllers for name in controller.missing_buttons]
+        if missing_buttons:
+            pm.warning(f"Buttons not found in the view, connections skipped: {', '.join(missing_buttons)}")
+
+class ControlsController(QtCore.QObject, ViewController):
+    # Shape or color applied by each button, looked up from the sender's object name by the button slots.
+    CONTROL_BUTTONS = {
+        "btnCircle":     ctrl_lib.Shapes.CIRCLE,
+        "btnSquare":     ctrl_lib.Shapes.SQUARE,
+        "btnTriangle":   ctrl_lib.Shapes.TRIANGLE,
+
+        "btnArrow":      ctrl_lib.Shapes.ARROW,
+        "btnPin":        ctrl_lib.Shapes.PIN,
+        "btnCross":      ctrl_lib.Shapes.CROSS,
+
+        "btnCubeCN":     ctrl_lib.Shapes.CUBE_CN,
+        "btnCubeFk":     ctrl_lib.Shapes.CUBE_FK,
+        "btnSphere":     ctrl_lib.Shapes.SPHERE,
+        "btnOrient":     ctrl_lib.Shapes.ORIENT_3D,
+        "btnButton":     ctrl_lib.Shapes.BUTTON,
+        "btnRing":       ctrl_lib.Shapes.RING,
+        "btnControlText":ctrl_lib.Shapes.TEXT,
+        "btnSlider":     ctrl_lib.Shapes.SLIDER,
+        "btnOsipa":      ctrl_lib.Shapes.OSIPA,
+        "btnSemiCircle": ctrl_lib.Shapes.SEMI_CIRCLE,
+    }
+
+    COLOR_BUTTONS = {
+        "BtnShapeColorRed":    ctrl_lib.ColorIndex.RED,
+        "BtnShapeColorYellow": ctrl_lib.ColorIndex.YELLOW,
+        "BtnShapeColorBlue":   ctrl_lib.ColorIndex.BLUE,
+        "BtnShapeColorPurple": ctrl_lib.ColorIndex.PURPLE,
+        "BtnShapeColorGreen":  ctrl_lib.ColorIndex.GREEN,
+    }
+
+    BUTTON_CONNECTIONS = (
+        *((button_name, "press_control_button") for button_name in CONTROL_BUTTONS),
+
+        ("BtnShapeOperationReplace", "control_shape_replace"),
+        ("BtnShapeOperarionCombine", "control_shape_add"),
+        ("BtnShapeOperationSwap",    "control_shape_swap"),
+        ("BtnShapeOperationCopy",    "control_shape_copy"),
+        ("BtnShapeOpereationMirror", "control_shape_mirror"),
+        ("BtnResetControl",          "reset_controls"),
+
+        *((button_name, "press_color_button") for button_name in COLOR_BUTTONS),
+    )
+
+    # Button name, slot name and whether the slot takes the click count. Rapid clicks run the slot once.
+    THROTTLED_CONNECTIONS = (
+        ("BtnShapeResizePlus",  "control_shape_size_down", True),
+        ("BtnShapeResizeMinus", "control_shape_size_up",   True),
+        ("BtnShapeThick",       "control_shape_thicken",   False),
+        ("BtnShapeThin",        "control_shape_thin",      False),
+    )
+
+    CHECKBOX_CONNECTIONS = (
+        ("RdoControlConstrained",   "update_connect_checkboxes"),
+        ("RdoControlDirectConnect", "update_connect_checkboxes"),
+    )
+
+    def __init__(self, view, buttons: dict=None):
+        QtCore.QObject.__init__(self, view) # Parented to the view, so Qt releases the controller with the window.
+        ViewController.__init__(self, view, buttons)
+
+    def bind_view(self, buttons: dict) -> list[str]:
+        missing_buttons = ViewController.bind_view(self, buttons)
+
+        self.throttles = []
+        for button_name, method_name, pass_count in self.THROTTLED_CONNECTIONS:
+            button = buttons.get(button_name)
+            if button is None:
+                missing_buttons.append(button_name)
+                continue
+            throttle = SignalThrottle(getattr(self, method_name), pass_count=pass_count, parent=self)
+            button.clicked.connect(throttle.trigger)
+            self.throttles.append(throttle)
         
-        connections = {
-            "RdoControlConstrained": self.update_connect_checkboxes,
-            "RdoControlDirectConnect": self.update_connect_checkboxes,
-        }
-        for button_name, method in connections.items():
-            button = getattr(self.view, button_name, None)
+        for button_name, method_name in self.CHECKBOX_CONNECTIONS:
+            button = buttons.get(button_name)
             if button:
-                button.stateChanged.connect(method)
+                button.stateChanged.connect(getattr(self, method_name))
+        return missing_buttons
     
     def update_connect_checkboxes(self):
 
@@ -233,7 +309,15 @@ class ControlsController:
         normal_Z = self.view.rdoControlOrientZ.isChecked()
         return (int(normal_X), int(normal_Y), int(normal_Z))
 
-    @common.undo_chunk("Create Control")
+    @QtCore.Slot()
+    def press_control_button(self):
+        self.press_create_control(self.CONTROL_BUTTONS[self.sender().objectName()])
+
+    @QtCore.Slot()
+    def press_color_button(self):
+        self.control_shape_color_index(self.COLOR_BUTTONS[self.sender().objectName()])
+
+    @common.undo_chunk("Create Control", suspend_evaluation=True, hide_display_layers=True)
     def press_create_control(self, creation_shape: ctrl_lib.Shapes):
 
         creation_parameters = {
@@ -250,26 +334,35 @@ class ControlsController:
         if not "_" in selection:
             selection = maya_lib.sort_by_hierarchy(selection) or [creation_shape.value]
         
+        # A single control has no parent to look for.
+        parent_objects = maya_lib.find_first_ancestors(selection) if len(selection) > 1 else {}
         controls = {}
-        for index, obj in enumerate(selection):
+        children_by_parent = {}
+        for obj in selection:
             # Control creation.
             control_name = f"{obj}_ctrl" if obj != "_" else creation_shape.value
             creation_parameters["control_name"] = control_name
             control_instance = ctrl_lib.create_control(**creation_parameters)
             control_instance.align_to(obj)
-            
-            # Find parent control if exists.
-            parent_object = maya_lib.find_first_ancestor(obj, selection[:index])
-            parent_control = controls.get(parent_object, None) if parent_object else None
-            if parent_control:
-                control_instance.parent_to(parent_control.transform)
-
             controls[obj] = control_instance 
 
             self._control_offset(control_instance)
             if obj != "_":
                 self._control_connection(control_instance, target=obj)
 
+            # Find parent control if exists.
+            parent_object = parent_objects.get(obj)
+            parent_control = controls.get(parent_object, None) if parent_object else None
+            if parent_control:
+                # New controls sit under the world until the parent pass, so their root is the whole control
+                # (offset groups, and the frame of slider-like controls included).
+                top_node = control_instance.transform.root()
+                children_by_parent.setdefault(parent_control.transform, []).append(top_node)
+
+        # World poses are kept on parenting, so every child of a control is parented in a single command.
+        for parent_transform, children in children_by_parent.items():
+            pm.parent(children, parent_transform)
+
         transform_curves = [ctrl.transform for ctrl in controls.values()]
         pm.select(transform_curves, replace=True)
 
@@ -280,8 +373,7 @@ class ControlsController:
         destiny = selected_objects[-1]
         
         control = ctrl_lib.Control(destiny)
-        control.shape_replace(*source)
-        pm.delete(source)
+        control.shape_replace(*source, delete_source=True)
     
     @common.undo_chunk("Add Control Shape")
     def control_shape_add(self):
@@ -290,8 +382,7 @@ class ControlsController:
         destiny = selected_objects[-1]
         
         control = ctrl_lib.Control(destiny)
-        control.shape_combine(*source)
-        pm.delete(source)
+        control.shape_combine(*source, delete_source=True)
 
     @common.undo_chunk("Swap Control Shape")
     def control_shape_swap(self):
@@ -300,128 +391,100 @@ class ControlsController:
         destiny = selected_objects[1:]
         
         source_instance = ctrl_lib.Control(source)
-        for obj in destiny:
+        def swap_shape(control: ctrl_lib.Control):
             copy = source_instance.copy()
-            copy.align_to(obj)
-
-            control = ctrl_lib.Control(obj)
-            control.shape_replace(copy.transform)
-            pm.delete(copy.transform)
+            copy.align_to(control.transform)
+            control.shape_replace(copy.transform, delete_source=True)
 
+        self._for_each_selected_control(swap_shape, selected_controls=destiny)
         pm.select(destiny)
     
     @common.undo_chunk("Copy Control Shape")
     def control_shape_copy(self):
-        selected_objects = pm.selected()
-        for obj in selected_objects:
-            control = ctrl_lib.Control(obj)
-            control.copy()
+        selected_objects = self._for_each_selected_control(ctrl_lib.Control.copy)
         pm.select(selected_objects)
 
     @common.undo_chunk("Mirror Control Shape")
     def control_shape_mirror(self):
-        selected_objects = pm.selected()
-        for obj in selected_objects:
-            control = ctrl_lib.Control(obj)
-            control.mirror()
+        self._for_each_selected_control(ctrl_lib.Control.mirror)
 
-    def _resize_control_shape(self, scale_factor):
-        selected_controls = pm.selected()
+    def _for_each_selected_control(self, function, selected_controls: list[str]=None) -> list[str]:
+        """Call function with a single Control bound to each selected transform in turn. Returns the processed names."""
+        if selected_controls is None:
+            selected_controls = cmds.ls(sl=True, long=True, type="transform")
+        control = ctrl_lib.Control()
         for obj in selected_controls:
-            control = ctrl_lib.Control(obj)
-            control.shape_scale(scale_factor)
+            function(control.bind(obj))
+        return selected_controls
+
+    def _resize_control_shape(self, scale_factor):
+        self._for_each_selected_control(lambda control: control.shape_scale(scale_factor))
 
     @common.undo_chunk("Increase Control Shape Size")
-    def control_shape_size_up(self):
+    def control_shape_size_up(self, clicks=1):
         scale = 1.0
-        scale = scale - float(self.view.TxtShapeResizeFactor.text() or 0.0)
+        scale = (scale - float(self.view.TxtShapeResizeFactor.text() or 0.0)) ** clicks
         self._resize_control_shape([scale,scale,scale])
 
     @common.undo_chunk("Decrease Control Shape Size")
-    def control_shape_size_down(self):
+    def control_shape_size_down(self, clicks=1):
         scale = 1.0
-        scale = scale + float(self.view.TxtShapeResizeFactor.text() or 0.0)
+        scale = (scale + float(self.view.TxtShapeResizeFactor.text() or 0.0)) ** clicks
         self._resize_control_shape([scale,scale,scale])
 
     @common.undo_chunk("Thicken Control Shape")
     def control_shape_thicken(self):
-        selected_controls = pm.selected()
-        for obj in selected_controls:
-            if not common.is_transform(obj):
-                continue
-            control = ctrl_lib.Control(obj)
-            control.shape_line_thick()
+        self._for_each_selected_control(ctrl_lib.Control.shape_line_thick)
     
     @common.undo_chunk("Thin Control Shape")
     def control_shape_thin(self):
-        selected_controls = pm.selected()
-        for obj in selected_controls:
-            if not common.is_transform(obj):
-                continue
-            control = ctrl_lib.Control(obj)
-            control.shape_line_thin()
+        self._for_each_selected_control(ctrl_lib.Control.shape_line_thin)
 
     @common.undo_chunk("Change Control Color Index")
     def control_shape_color_index(self, color_index: ctrl_lib.ColorIndex):        
-        #color_index = ctrl_lib.ColorIndex.RED.value  # UI input.
-
-        selected_controls = pm.selected()
-        for obj in selected_controls:
-            control = ctrl_lib.Control(obj)
-            control.shape_color_index(color_index)
+        self._for_each_selected_control(lambda control: control.shape_color_index(color_index))
 
     @common.undo_chunk("Reset Controls")
     def reset_controls(self):
-        selected_controls = pm.selected()
+        selected_controls = self._for_each_selected_control(ctrl_lib.Control.reset)
         if not selected_controls:
             pm.warning("No selection found.")
-            return
-        for obj in selected_controls:
-            control = ctrl_lib.Control(obj)
-            control.reset()
 
-class EditController:
-    def __init__(self, view):
-        self.view = view
-        self.bind_view()
-
-    def bind_view(self):
+class EditController(QtCore.QObject, ViewController):
+    BUTTON_CONNECTIONS = (
+        ("BtnFreezeTransform",   "press_freeze_transformations"),
+        ("BtnCleanHistory",      "press_delete_history"),
+        ("btnZeroOut",           "press_create_offset_group"),
+        ("BtnMoveOffset",        "press_move_offset_group"),
         
-        connections = {
-            "BtnFreezeTransform":   self.press_freeze_transformations,
-            "BtnCleanHistory":      self.press_delete_history,
-            "btnZeroOut":           self.press_create_offset_group,
-            "BtnMoveOffset":        self.press_move_offset_group,
-            
-            # Alignment functions.
-            "BtnAlignTransform":    self.press_align_many_to_one,
-            "BtnMoveToSurface":     partial(self.press_align_with_mesh_surface, "move"),
-            "BtnOrientToSurface":   partial(self.press_align_with_mesh_surface, "orient"),
-            
-            # Creation functions.
-            "BtnCreateLocator":     partial(self.press_create_at_selection, maya_lib.create_locator, "locator"),
-            "BtnCreateJoint":       partial(self.press_create_at_selection, maya_lib.create_joint,   "joint"),
-            "BtnCreateGroup":       partial(self.press_create_at_selection, maya_lib.create_group,   "group"),
-            
-            "BtnBuildHierarchy":    self.press_build_hierarchy
-        }
+        # Alignment functions.
+        ("BtnAlignTransform",    "press_align_many_to_one"),
+        ("BtnMoveToSurface",     "press_move_to_surface"),
+        ("BtnOrientToSurface",   "press_orient_to_surface"),
+        
+        # Creation functions.
+        ("BtnCreateLocator",     "press_create_locator"),
+        ("BtnCreateJoint",       "press_create_joint"),
+        ("BtnCreateGroup",       "press_create_group"),
+        
+        ("BtnBuildHierarchy",    "press_build_hierarchy"),
+    )
 
-        for button_name, method in connections.items():
-            button = getattr(self.view, button_name, None)
-            if button:
-                button.clicked.connect(method)
+    def __init__(self, view, buttons: dict=None):
+        QtCore.QObject.__init__(self, view) # Parented to the view, so Qt releases the controller with the window.
+        ViewController.__init__(self, view, buttons)
 
     @common.undo_chunk("Freeze Transformations")    
     def press_freeze_transformations(self):
         selected_objects = pm.selected()
-        for obj in selected_objects:
-            maya_lib.freeze_transform(obj)
+        if selected_objects:
+            maya_lib.freeze_transform(selected_objects)
 
     @common.undo_chunk("Delete History")
     def press_delete_history(self):
         selected_objects = pm.selected()
-        for obj in selected_objects:
-            maya_lib.delete_history(obj)
+        if selected_objects:
+            maya_lib.delete_history(selected_objects)
 
     @common.undo_chunk("Create Offset Group")
     def press_create_offset_group(self):
@@ -440,14 +503,16 @@ class EditController:
     def press_move_offset_group(self):
         selected_objects = pm.selected()
         for obj in selected_objects:
-            matrix = obj.getMatrix(ws=True)
-            offset = obj.getParent()
-            offset.setMatrix(matrix, ws=True)
-            obj.setMatrix(matrix, ws=True)
+            maya_lib.center_offset(obj)
 
     @common.undo_chunk("Align Many to One")
     def press_align_many_to_one(self):
-        master, *slaves = pm.selected()
+        selected_objects = pm.selected()
+        if not selected_objects:
+            pm.warning("No selection found.")
+            return
+
+        master, *slaves = selected_objects
         if not common.is_transform(master):
             pm.warning(f"Master object '{master}' is not a transform. Alignment skipped.")
             return
@@ -458,9 +523,24 @@ class EditController:
                 continue
             maya_lib.align_transform(master, slave)
 
+    @QtCore.Slot()
+    def press_move_to_surface(self):
+        self.press_align_with_mesh_surface("move")
+
+    @QtCore.Slot()
+    def press_orient_to_surface(self):
+        self.press_align_with_mesh_surface("orient")
+
     @common.undo_chunk("Align with Mesh Surface")
     def press_align_with_mesh_surface(self, adjustment_type:str):
-        mesh, *slaves = pm.selected()
+        align_functions = {"move": mesh_lib.move_to_mesh_surface,
+                           "orient": mesh_lib.orient_to_mesh_surface}
+        align_function = align_functions.get(adjustment_type)
+        selected_objects = pm.selected()
+        if not align_function or not selected_objects:
+            return
+
+        mesh, *slaves = selected_objects
         if not common.is_mesh(mesh):
             pm.warning(f"Mesh object '{mesh}' is not a mesh. Alignment skipped.")
             return
@@ -468,10 +548,7 @@ class EditController:
         for slave in slaves:
             if not common.is_transform(slave):
                 continue
-            if adjustment_type == "move":
-                mesh_lib.move_to_mesh_surface(mesh, slave)
-            elif adjustment_type == "orient":
-                mesh_lib.orient_to_mesh_surface(mesh, slave)
+            align_function(mesh, slave)
 
     def _create_at_center(self, selected_objects, create_func, suffix, all_transform=False, all_components=False):
         created_node = create_func()
@@ -479,9 +556,8 @@ class EditController:
             constraints = maya_lib.parent_constraint_many_to_one(*selected_objects, slave=created_node, maintain_offset=False)
             pm.delete(constraints)
         elif all_components:
-            cluster = pm.cluster(selected_objects, n="temp_cluster")[1]
-            maya_lib.align_transform(cluster, created_node)
-            pm.delete(cluster)
+            center_point = maya_lib.get_components_center(selected_objects)
+            created_node.setTranslation(center_point, space="world")
         else:
             return
         
@@ -508,6 +584,18 @@ class EditController:
                 created_node.rename(name)
                 
             
+    @QtCore.Slot()
+    def press_create_locator(self):
+        self.press_create_at_selection(maya_lib.create_locator, "locator")
+
+    @QtCore.Slot()
+    def press_create_joint(self):
+        self.press_create_at_selection(maya_lib.create_joint, "joint")
+
+    @QtCore.Slot()
+    def press_create_group(self):
+        self.press_create_at_selection(maya_lib.create_group, "group")
+
     @common.undo_chunk("Create at Selection")
     def press_create_at_selection(self, create_func, suffix):        
         selected_objects = pm.selected(fl=True)
@@ -536,51 +624,39 @@ class EditController:
         selected_objects = pm.selected()
         maya_lib.build_hierarchy_from_list(selected_objects)
 
-class ComponentController:
-    def __init__(self, view):
-        self.view = view
-        self.bind_view()
-
-    def bind_view(self):
-        connections = {
-            # Template module functions
-            "BtnCreateTemplate":       self.press_create_template,
-            "btnAlignObject2Template": self.press_move_objects_to_templates,
-            "btnAlignTemplate2Object": self.press_move_templates_to_objects,
-            "btnTemplateAlignMid":     self.press_constraint_templates_to_midpoint,
-            "btnTemplateAimTo":        self.press_orient_templates_to_template,
-            
-            # Attribute setups.
-            "BtnSetupSourceAttributePick": self.press_pick_source_attribute,
-            "BtnCreateProxyAttribute": self.press_create_proxy_attribute,
-            "BtnSetDefaultValue":      self.press_set_default_value,
-
-            # Mesh setups.
-            "BtnSetupMeshSourcePick": self.press_pick_mesh_source,
-            "BtnCopySkin":            self.press_copy_skin,
-            "BtnCreateRivet":         self.press_create_rivets,
-            "BtnCreateSS":            self.press_create_ss,
-
-            "BtnConnectAll":        self.press_connect_all_attributes,
-            "BtnConnectTranslate":  self.press_connect_translate_attributes,
-            "BtnConnectRotation":   self.press_connect_rotation_attributes,
-            "BtnConnectScale":      self.press_connect_scale_attributes,
-            "BtnConnectVisibility": self.press_connect_visibility_attributes,
-            "BtnConnectCustom":     self.press_connect_custom_attributes,
-
-            # Ribbon module functions
-            "btnCreateSurface":       self.press_create_surface,
-            "BtnRibbonNamePick":      self.press_pick_surface_name,
-            "BntCreateRibbon":        self.press_build_ribbon,
-        }
+class ComponentController(ViewController):
+    BUTTON_CONNECTIONS = (
+        # Template module functions
+        ("BtnCreateTemplate",       "press_create_template"),
+        ("btnAlignObject2Template", "press_move_objects_to_templates"),
+        ("btnAlignTemplate2Object", "press_move_templates_to_objects"),
+        ("btnTemplateAlignMid",     "press_constraint_templates_to_midpoint"),
+        ("btnTemplateAimTo",        "press_orient_templates_to_template"),
+
+        # Attribute setups.
+        ("BtnSetupSourceAttributePick", "press_pick_source_attribute"),
+        ("BtnCreateProxyAttribute", "press_create_proxy_attribute"),
+        ("BtnSetDefaultValue",      "press_set_default_value"),
+
+        # Mesh setups.
+        ("BtnSetupMeshSourcePick", "press_pick_mesh_source"),
+        ("BtnCopySkin",            "press_copy_skin"),
+        ("BtnCreateRivet",         "press_create_rivets"),
+        ("BtnCreateSS",            "press_create_ss"),
+
+        ("BtnConnectAll",        "press_connect_all_attributes"),
+        ("BtnConnectTranslate",  "press_connect_translate_attributes"),
+        ("BtnConnectRotation",   "press_connect_rotation_attributes"),
+        ("BtnConnectScale",      "press_connect_scale_attributes"),
+        ("BtnConnectVisibility", "press_connect_visibility_attributes"),
+        ("BtnConnectCustom",     "press_connect_custom_attributes"),
+
+        # Ribbon module functions
+        ("btnCreateSurface",       "press_create_surface"),
+        ("BtnRibbonNamePick",      "press_pick_surface_name"),
+        ("BntCreateRibbon",        "press_build_ribbon"),
+    )
 
-        for button_name, method in connections.items():
-            button = getattr(self.view, button_name, None)
-            if button:
-                button.clicked.connect(method)
-            else:
-                pm.warning(f"Button '{button_name}' not found in the view. Connection skipped.")
-    
     # Template functions
     @common.undo_chunk("Create Templates")   
     def press_create_template(self):
@@ -735,6 +811,7 @@ class ComponentController:
         pm.select(rivets)   
 
     def press_create_ss(self):
+        import chisel_rigging.components.squash_stretch as ss
         sources = self.view.TxtSetupMeshSource.text()
         name = self.view.TxtCreateSSName.text() or "SS"
         if not sources:
@@ -794,6 +871,7 @@ class ComponentController:
                 maya_lib.connect_attributes(master=master, slave=slave, attributes=[attr])
 
     def _create_surface(self, name, reference_transforms):
+        import chisel_rigging.components.ribbon as ribbon
         up_axis = None
         if self.view.rdoSurfaceOrientX.isChecked():
             up_axis = ribbon.SurfaceOrient.X_UP
@@ -813,6 +891,7 @@ class ComponentController:
     # Ribbon functions
     @common.undo_chunk("Create Surface")
     def press_create_surface(self):
+        import chisel_rigging.components.ribbon as ribbon
         selected_objects = pm.selected()
         
         if not selected_objects:
@@ -844,8 +923,9 @@ class ComponentController:
         
         self.view.TxtRibbonName.setText(text)
 
-    @common.undo_chunk("Build Ribbon")
+    @common.undo_chunk("Build Ribbon", suspend_evaluation=True, hide_display_layers=True)
     def press_build_ribbon(self):
+        import chisel_rigging.components.ribbon as ribbon
         selection = pm.selected()
         
         if not selection:
@@ -876,53 +956,43 @@ class ComponentController:
                                ctrl_quantity   = ctrl_quantity)
         module.build()
 
-class SurgeryController:
-    def __init__(self, view):
-        self.view = view
-        self.bind_view()
-
-    def bind_view(self):
-        connections = {
-            "BtnConstraintDrivers": self.press_constraint_drivers,
-            "BtnConstraintNodes":   self.press_constraint_nodes,
-            "BtnConstraintRename":  self.press_constraint_rename,
+class SurgeryController(ViewController):
+    BUTTON_CONNECTIONS = (
+        ("BtnConstraintDrivers", "press_constraint_drivers"),
+        ("BtnConstraintNodes",   "press_constraint_nodes"),
+        ("BtnConstraintRename",  "press_constraint_rename"),
 
-            "BtnSkinningJoints":   self.press_skinning_joints,
-            "BtnSkinningNodes":    self.press_skinning_nodes,
-            "BtnSkinningRename":   self.press_skinning_rename,
+        ("BtnSkinningJoints",   "press_skinning_joints"),
+        ("BtnSkinningNodes",    "press_skinning_nodes"),
+        ("BtnSkinningRename",   "press_skinning_rename"),
 
-            "BtnBlendshapeTargets":self.press_blendshape_targets,
-            "BtnBlendshapeNodes":  self.press_blendshape_nodes,
-            "BtnBlendshapeRename": self.press_blendshape_rename,
+        ("BtnBlendshapeTargets","press_blendshape_targets"),
+        ("BtnBlendshapeNodes",  "press_blendshape_nodes"),
+        ("BtnBlendshapeRename", "press_blendshape_rename"),
 
-            "BtnConnectionInputs": self.press_connection_inputs,
-            "BtnConnectionOutputs":self.press_connection_outputs,
-            
-            "BtnAxisVisible": self.press_axis_visible,
-            "BtnAxisHide":    self.press_axis_hide,
+        ("BtnConnectionInputs", "press_connection_inputs"),
+        ("BtnConnectionOutputs","press_connection_outputs"),
+        
+        ("BtnAxisVisible", "press_axis_visible"),
+        ("BtnAxisHide",    "press_axis_hide"),
 
-            "BtnJointVisible":          self.press_joint_visible,
-            "BtnJointHide":             self.press_joint_hide,
-            "BtnJointIncreaseRadius":   self.press_joint_increase_radius,
-            "BtnJointDecreaseRadius":   self.press_joint_decrease_radius,
-            "BtnJointSetRadiusOne":     self.press_joint_set_radius_one,
-            "BtnJointSetRadiusZero":    self.press_joint_set_radius_zero,
+        ("BtnJointVisible",          "press_joint_visible"),
+        ("BtnJointHide",             "press_joint_hide"),
+        ("BtnJointIncreaseRadius",   "press_joint_increase_radius"),
+        ("BtnJointDecreaseRadius",   "press_joint_decrease_radius"),
+        ("BtnJointSetRadiusOne",     "press_joint_set_radius_one"),
+        ("BtnJointSetRadiusZero",    "press_joint_set_radius_zero"),
 
-            "BtnDisplayNormal":     self.press_display_normal,
-            "BtnDisplayTemplate":   self.press_display_template,
-            "BtnDisplayReference":  self.press_display_reference,
+        ("BtnDisplayNormal",     "press_display_normal"),
+        ("BtnDisplayTemplate",   "press_display_template"),
+        ("BtnDisplayReference",  "press_display_reference"),
 
-            "BtnLockNodes":   self.press_lock_nodes,
-            "BtnUnlockNodes": self.press_unlock_nodes,
+        ("BtnLockNodes",   "press_lock_nodes"),
+        ("BtnUnlockNodes", "press_unlock_nodes"),
 
-            "BtnCleanUnused": self.press_clean_unused,
-            "BtnCleanUnknown":self.press_clean_unknown
-        }
-
-        for button_name, method in connections.items():
-            button = getattr(self.view, button_name, None)
-            if button:
-                button.clicked.connect(method)
+        ("BtnCleanUnused", "press_clean_unused"),
+        ("BtnCleanUnknown","press_clean_unknown"),
+    )
 
     def press_constraint_drivers(self):
         selection = pm.selected()
@@ -1041,80 +1111,51 @@ class SurgeryController:
         pm.select(found_outputs, replace=True)
 
     def press_axis_visible(self):
-        selection = pm.selected()
-        for obj in selection:
-            if not common.is_transform(obj):
-                continue
+        for obj in common.SelectionContext().get_transforms():
             maya_lib.show_axis(obj)
     
     def press_axis_hide(self):
-        selection = pm.selected() or pm.ls(type=pm.nt.Transform)
-        for obj in selection:
-            if not common.is_transform(obj):
-                continue
+        selection = common.SelectionContext()
+        nodes = selection.get_transforms() if len(selection) else pm.ls(type=pm.nt.Transform)
+        for obj in nodes:
             maya_lib.hide_axis(obj)
 
     def press_joint_visible(self):
-        selection = pm.selected()
-        for obj in selection:
-            if not common.is_joint(obj):
-                continue
+        for obj in common.SelectionContext().get_joints():
             maya_lib.show_joint(obj)
     
     def press_joint_hide(self):
-        selection = pm.selected() or pm.ls(type=pm.nt.Joint)
-        for obj in selection:
-            if not common.is_joint(obj):
-                continue
+        selection = common.SelectionContext()
+        nodes = selection.get_joints() if len(selection) else pm.ls(type=pm.nt.Joint)
+        for obj in nodes:
             maya_lib.hide_joint(obj)
         
     def press_joint_increase_radius(self):
-        selection = pm.selected()
-        for obj in selection:
-            if not common.is_joint(obj):
-                continue
+        for obj in common.SelectionContext().get_joints():
             maya_lib.increase_joint_radius(obj, 0.1)
 
     def press_joint_decrease_radius(self):
-        selection = pm.selected()
-        for obj in selection:
-            if not common.is_joint(obj):
-                continue
+        for obj in common.SelectionContext().get_joints():
             maya_lib.decrease_joint_radius(obj, 0.1)
 
     def press_joint_set_radius_one(self):
-        selection = pm.selected()
-        for obj in selection:
-            if not common.is_joint(obj):
-                continue
+        for obj in common.SelectionContext().get_joints():
             obj.radius.set(1.0)
     
     def press_joint_set_radius_zero(self):
-        selection = pm.selected()
-        for obj in selection:
-            if not common.is_joint(obj):
-                continue
+        for obj in common.SelectionContext().get_joints():
             obj.radius.set(0.0)
 
     def press_display_normal(self):
-        selection = pm.selected()
-        for obj in selection:
-            if not common.is_transform(obj):
-                continue
+        for obj in common.SelectionContext().get_transforms():
             maya_lib.set_display_normal(obj)
 
     def press_display_template(self):
-        selection = pm.selected()
-        for obj in selection:
-            if not common.is_transform(obj):
-                continue
+        for obj in common.SelectionContext().get_transforms():
             maya_lib.set_display_template(obj)
     
     def press_display_reference(self):
-        selection = pm.selected()
-        for obj in selection:
-            if not common.is_transform(obj):
-                continue
+        for obj in common.SelectionContext().get_transforms():
             maya_lib.set_display_reference(obj)
 
     def press_lock_nodes(self):
@@ -1133,24 +1174,14 @@ class SurgeryController:
     def press_clean_unknown(self):
         maya_lib.delete_unknown_nodes()
 
-class FilterController:
-    def __init__(self, view):
-        self.view = view
-        self.bind_view()
-
-    def bind_view(self):
-        connections = {
-            "btnFilterJoints":  self.press_filter_joints,
-            "btnFilterLocators":self.press_filter_locators,
-            "btnFilterMeshes":  self.press_filter_meshes,
-            "btnFilterNurbs":   self.press_filter_nurbs,
-            "btnFilterLeaves":  self.press_filter_leaves,
-        }
-
-        for button_name, method in connections.items():
-            button = getattr(self.view, button_name, None)
-            if button:
-                button.clicked.connect(method)
+class FilterController(ViewController):
+    BUTTON_CONNECTIONS = (
+        ("btnFilterJoints",  "press_filter_joints"),
+        ("btnFilterLocators","press_filter_locators"),
+        ("btnFilterMeshes",  "press_filter_meshes"),
+        ("btnFilterNurbs",   "press_filter_nurbs"),
+        ("btnFilterLeaves",  "press_filter_leaves"),
+    )
 
     def _is_filter_out(self):
         is_filter_out = self.view.RdoFilterOut.isChecked()
@@ -1,22 +1,61 @@
 '''
 Content: Common utility functions for rigging modules.
-Dependency: pymel.core, time, functools
+Dependency: pymel.core, maya.api.OpenMaya, time, collections, contextlib, functools
 Maya Version tested: 2024
 
 Author: Francisco Guzmán
 Email: francisco.guzmanga@gmail.com
 '''
 
+import maya.api.OpenMaya as om
 import pymel.core as pm
 import time
+from collections import Counter
+from contextlib import contextmanager
 from functools import wraps
 
 
+_ALPHABET = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+_BASE = len(_ALPHABET)
+
+AXIS_INDEX = {"x": 0, "y": 1, "z": 2, "X": 0, "Y": 1, "Z": 2}
+
+
 ####################################################################################################################################
 #  COMMON  #########################################################################################################################
 ####################################################################################################################################
 
-def undo_chunk(name):
+@contextmanager
+def suspended_refresh(suspend_evaluation=False):
+    """Suspend viewport refresh, and optionally switch the evaluation manager to DG, restoring both on exit."""
+    was_suspended = pm.refresh(q=True, suspend=True)
+    evaluation_mode = pm.evaluationManager(q=True, mode=True)[0] if suspend_evaluation else None
+    pm.refresh(suspend=True)
+    if evaluation_mode:
+        pm.evaluationManager(mode="off")
+    try:
+        yield
+    finally:
+        if evaluation_mode:
+            pm.evaluationManager(mode=evaluation_mode)
+        pm.refresh(suspend=was_suspended)
+
+@contextmanager
+def hidden_display_layers(hide=True):
+    """Hide the visible display layers, the default ones excluded, and show them again on exit."""
+    layers = []
+    if hide:
+        layers = [layer for layer in pm.ls(type="displayLayer")
+                  if not layer.name().endswith("defaultLayer") and layer.visibility.isSettable() and layer.visibility.get()]
+    for layer in layers:
+        layer.visibility.set(False)
+    try:
+        yield
+    finally:
+        for layer in layers:
+            layer.visibility.set(True)
+
+def undo_chunk(name, suspend_evaluation=False, hide_display_layers=False):
     def decorator(function):
         @wraps(function)
         def proxy(*args, **kwargs):
@@ -25,7 +64,8 @@ def undo_chunk(name):
             
             try:
                 display_message(text=f"Executing: {name}", message_type=MessageType.INFO)
-                func = function(*args, **kwargs)
+                with suspended_refresh(suspend_evaluation), hidden_display_layers(hide_display_layers):
+                    func = function(*args, **kwargs)
                 return func
             
             except Exception as ex:
@@ -63,8 +103,62 @@ def display_message(text: str, message_type=MessageType.INFO):
     
     if message_type in display_type:
         display_type[message_type](text)
+
+def get_dag_path(node: pm.PyNode) -> om.MDagPath:
+    """Get the OpenMaya 2.0 dag path of the given node or node name, to query it without going through MEL."""
+    selection = om.MSelectionList()
+    selection.add(str(node))
+    return selection.getDagPath(0)
+
+def get_dag_paths(nodes: list[pm.PyNode]) -> list[om.MDagPath]:
+    """Get the OpenMaya 2.0 dag paths of many unique nodes through a single selection list."""
+    selection = om.MSelectionList()
+    for node in nodes:
+        selection.add(str(node))
+    return [selection.getDagPath(index) for index in range(selection.length())]
         
 
+class SelectionContext:
+    """Active selection read once through OpenMaya 2.0 into parallel lists, so handlers filter it without building PyNodes.
+    Items outside the DAG keep their node name and have no dag path."""
+
+    def __init__(self):
+        selection = om.MGlobal.getActiveSelectionList()
+        self.dag_paths = []
+        self.long_names = []
+        self.short_names = []
+        self.is_transform = []
+        self.is_joint = []
+        for index in range(selection.length()):
+            node = selection.getDependNode(index)
+            if node.hasFn(om.MFn.kDagNode):
+                dag_path = selection.getDagPath(index)
+                self.dag_paths.append(dag_path)
+                self.long_names.append(dag_path.fullPathName())
+                self.short_names.append(dag_path.partialPathName())
+            else:
+                name = om.MFnDependencyNode(node).name()
+                self.dag_paths.append(None)
+                self.long_names.append(name)
+                self.short_names.append(name)
+            self.is_transform.append(node.hasFn(om.MFn.kTransform))
+            self.is_joint.append(node.hasFn(om.MFn.kJoint))
+
+    def __len__(self):
+        return len(self.long_names)
+
+    def _get_nodes(self, mask: list[bool]) -> list[pm.PyNode]:
+        return [pm.PyNode(name) for name, is_valid in zip(self.long_names, mask) if is_valid]
+
+    def get_transforms(self) -> list[pm.nt.Transform]:
+        """PyNodes of the selected transforms only."""
+        return self._get_nodes(self.is_transform)
+
+    def get_joints(self) -> list[pm.nt.Joint]:
+        """PyNodes of the selected joints only."""
+        return self._get_nodes(self.is_joint)
+
+
 ####################################################################################################################################
 #  MATH FUNCTIONS  #################################################################################################################
 ####################################################################################################################################
@@ -113,29 +207,26 @@ def calculate_pole_vector(start_pos: pm.dt.Vector, end_pos: pm.dt.Vector, mid_po
 
 def find_repeated_names() -> list[str]:
     """Search for repeated names in DAG nodes."""
-    nodes = pm.ls("*", dag=True, long=True)
-    repeated_names = [node.shortName() for node in nodes if "|" in node.shortName()]
-    return list(set(repeated_names))
+    paths = pm.ls("*", dag=True, long=True)
+    short_names = Counter(str(path).rsplit("|", 1)[-1] for path in paths)
+    return [name for name, count in short_names.items() if count > 1]
 
 def convert_number_to_character(number: int) -> str:
     """Converts a non-negative integer to its corresponding Excel-style column name."""
     if number < 0: raise ValueError("Number must be non-negative.")
-    alphabet = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
-    base = len(alphabet)
-    result = ''
+    characters = []
     while number >= 0:
-        result = alphabet[number % base] + result
-        number = number // base - 1
-    return result
+        number, remainder = divmod(number, _BASE)
+        characters.append(_ALPHABET[remainder])
+        number -= 1
+    return ''.join(reversed(characters))
 
 def convert_character_to_number(char: str) -> int:
     """Converts an Excel-style column name to its corresponding non-negative integer."""
-    if not char.isalpha(): raise ValueError("Input must be a non-empty string of alphabetic characters.")
-    alphabet = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
-    base = len(alphabet)
+    if not (char.isascii() and char.isalpha()): raise ValueError("Input must be a non-empty string of alphabetic characters.")
     result = 0
-    for i, c in enumerate(reversed(char.upper())):
-        result += (alphabet.index(c) + 1) * (base ** i)
+    for c in char.upper():
+        result = result * _BASE + (ord(c) - 64)  # ord('A') - 1
     return result - 1
 
 def generate_unique_name(base_name: str) -> str:
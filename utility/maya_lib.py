@@ -1,6 +1,6 @@
 '''
 Content: Collection of functions to work with Maya nodes.
-Dependency: pymel.core, Enum, common
+Dependency: pymel.core, maya.cmds, maya.api.OpenMaya, numpy, Enum, common
 Maya Version tested: 2024
 
 Author: Francisco Guzmán
@@ -9,6 +9,9 @@ email: francisco.guzmanga@gmail.com
 
 
 from enum import Enum
+import maya.api.OpenMaya as om
+import maya.cmds as cmds
+import numpy as np
 import pymel.core as pm
 import chisel_rigging.utility.common as common
 import chisel_rigging.utility.mesh_lib as mesh_lib
@@ -21,6 +24,11 @@ class Vector(Enum):
     Z_POS = (0, 0, 1)
     Z_NEG = (0, 0, -1)
 
+_FLIP_AXIS = {"x": (-1.0,  1.0,  1.0),
+              "y": ( 1.0, -1.0,  1.0),
+              "z": ( 1.0,  1.0, -1.0)}
+_BOX_CORNERS = np.array([[(i >> axis) & 1 for axis in range(3)] for i in range(8)], dtype=bool)
+
 ####################################################################################################################################
 # Attribute Manipulation Functions  ################################################################################################
 ####################################################################################################################################
@@ -281,59 +289,68 @@ def flip_transform(transform_node: pm.nt.Transform, axis="x", replace_str=("_L",
         replace_str: Strings to replace in the name. Defaults to ("_L", "_R").
         use_scale: Whether to use scale for flipping. Defaults to True.
     """
-    flip_axis = {"x": [-1,  1,  1],
-                 "y": [ 1, -1,  1],
-                 "z": [ 1,  1, -1]}
+    x, y, z = _FLIP_AXIS[axis]
     if use_scale:
-        pivot_node = pm.nt.Transform(n="pivot_temp")
-        pm.parent(transform_node, pivot_node)
-        pivot_node.setScale(flip_axis[axis])
-        pm.parent(transform_node, world=True)
-        pm.delete(pivot_node)
+        # Same result as scaling a temporary pivot at the origin, without creating nodes.
+        flip_matrix = pm.dt.Matrix([[x, 0, 0, 0],
+                                    [0, y, 0, 0],
+                                    [0, 0, z, 0],
+                                    [0, 0, 0, 1]])
+        world_matrix = transform_node.getMatrix(worldSpace=True)
+        transform_node.setMatrix(world_matrix * flip_matrix, worldSpace=True)
     else:
         original_pos = transform_node.getTranslation(ws=True)
-        new_pos = original_pos * flip_axis[axis]
+        new_pos = pm.dt.Vector(original_pos.x * x, original_pos.y * y, original_pos.z * z)
         transform_node.setTranslation(new_pos, ws=True)
 
-def mirror_transform(transform_node: pm.nt.Transform, axis="x", replace_str=("_L", "_R"), use_scale=True) -> pm.nt.Transform:
+def mirror_transform(transform_node: pm.nt.Transform, axis="x", replace_str=("_L", "_R"), use_scale=True, duplicate_shapes=False) -> pm.nt.Transform:
     """Create a copy of transform node and flip it along the specified axis.
     Args:
         transform_node: Transform node to mirror.
         axis: Axis to mirror along. Defaults to "x".
         replace_str: Strings to replace in the name. Defaults to ("_L", "_R").
         use_scale: Whether to use scale for mirroring. Defaults to True.
+        duplicate_shapes: Whether to duplicate the whole node with its shapes and children,
+                          otherwise only an empty transform with the same pose is created. Defaults to False.
     Returns:
         pm.nt.Transform: The mirrored transform node.
     """
-    duplicated_transform = pm.duplicate(transform_node)[0]
-    flip_transform(transform_node=duplicated_transform, axis=axis, use_scale=use_scale)
-    
-    # update name of mirrored object.
-    transform_name = transform_node.name()
-    new_name = transform_name.replace(replace_str[0], replace_str[1])
-    pm.rename(duplicated_transform, new_name)
-    return duplicated_transform
+    new_name = transform_node.nodeName().replace(replace_str[0], replace_str[1])
+    if duplicate_shapes:
+        mirrored_transform = pm.duplicate(transform_node, n=new_name)[0]
+    else:
+        mirrored_transform = pm.nt.Transform(n=new_name)
+        mirrored_transform.setMatrix(transform_node.getMatrix(worldSpace=True), worldSpace=True)
+
+    flip_transform(transform_node=mirrored_transform, axis=axis, use_scale=use_scale)
+    return mirrored_transform
 
 def align_transform(master_transform: pm.nt.Transform, slave_transform: pm.nt.Transform, 
                     use_position=True, 
                     use_rotation=True, 
                     use_scale=False) -> None:
-    """Move slave transform to the exact matrix of the master transform."""
+    """Move slave transform to the exact matrix of the master transform.
+       Position is taken from the master's rotate pivot, as a point constraint would do.
+    """
+    if not (use_position or use_rotation or use_scale):
+        return
+    master_matrix = pm.dt.TransformationMatrix(master_transform.getMatrix(worldSpace=True))
+    slave_matrix = pm.dt.TransformationMatrix(slave_transform.getMatrix(worldSpace=True))
+
     if use_position:
-        constraint = pm.pointConstraint(master_transform, slave_transform)
-        pm.delete(constraint)
+        slave_matrix.setTranslation(master_transform.getRotatePivot(space="world"), "world")
     if use_rotation:
-        constraint = pm.orientConstraint(master_transform, slave_transform)
-        pm.delete(constraint)
+        slave_matrix.setRotationQuaternion(*master_matrix.getRotationQuaternion())
     if use_scale:
-        constraint = pm.scaleConstraint(master_transform, slave_transform)
-        pm.delete(constraint)
+        slave_matrix.setScale(master_matrix.getScale("world"), "world")
+    slave_transform.setMatrix(slave_matrix.asMatrix(), worldSpace=True)
 
 def freeze_transform(transform_node: pm.nt.Transform, position=True, rotation=True, scale=True):
-    """Freeze the transformations of a transform node."""
+    """Freeze the transformations of a transform node, or of a list of them in a single command."""
     pm.makeIdentity(transform_node, apply=True, t=position, r=rotation, s=scale, n=False)
 
 def delete_history(transform_node: pm.nt.Transform):
+    """Delete the construction history of a node, or of a list of them in a single command."""
     pm.delete(transform_node, ch=True)
 
 def reset_transform(transform_node: pm.nt.Transform, position=True, rotation=True, scale=True):
@@ -362,29 +379,18 @@ def get_side_of_transform(transform_node: pm.nt.Transform, axis="x") -> int:
     Returns:
         int: 1 for positive side, -1 for negative side, 0 for center.
     """
-    pos = pm.xform(transform_node, q=True, ws=True, t=True)
-    axis_index = {"x": 0, "y": 1, "z": 2}
-    coord = pos[axis_index[axis]]
-    if coord > 0:
-        return 1
-    elif coord < 0:
-        return -1
-    else:
-        return 0
+    pos = om.MFnTransform(common.get_dag_path(transform_node)).translation(om.MSpace.kWorld)
+    coord = pos[common.AXIS_INDEX[axis]]
+    return (coord > 0) - (coord < 0)
     
 def get_closest_transform(reference_transform: pm.nt.Transform, transform_list: list) -> pm.nt.Transform:
     """Get the closest transform from a list to the reference transform."""
-    ref_pos = pm.xform(reference_transform, q=True, ws=True, t=True)
-    closest_transform = None
-    min_distance = float('inf')
-    
-    for transform in transform_list:
-        target_pos = pm.xform(transform, q=True, ws=True, t=True)
-        distance = common.get_distance_between_transforms(ref_pos, target_pos)
-        if distance < min_distance:
-            closest_transform = transform
-            min_distance = distance
-    return closest_transform
+    if not transform_list:
+        return None
+    ref_pos = np.array(cmds.xform(str(reference_transform), q=True, ws=True, t=True))
+    positions = np.array([cmds.xform(str(transform), q=True, ws=True, t=True) for transform in transform_list])
+    squared_distances = ((positions - ref_pos) ** 2).sum(axis=1)
+    return transform_list[int(squared_distances.argmin())]
 
 ####################################################################################################################################
 #  OFFSET FUNCTIONS ################################################################################################################
@@ -392,11 +398,13 @@ def get_closest_transform(reference_transform: pm.nt.Transform, transform_list:
 def create_offset(transform_node: pm.nt.Transform, offset_name_suffix="_offset") -> pm.nt.Transform:
     """Create an offset group for the given transform node to zero out transformations."""
     name = f"{transform_node.name()}{offset_name_suffix}"
-    offset_transform = pm.nt.Transform(n=name)
-    pm.delete((pm.parentConstraint(transform_node, offset_transform)))
-    pm.delete((pm.scaleConstraint(transform_node, offset_transform)))
+    parent = transform_node.getParent()
 
-    pm.parent(offset_transform, transform_node.getParent())
+    # Placed on the node's world rotate pivot, orientation and scale, so nodes with a moved pivot (e.g. cluster handles) keep it.
+    offset_transform = pm.nt.Transform(n=name)
+    align_transform(transform_node, offset_transform, use_scale=True)
+    if parent:
+        pm.parent(offset_transform, parent)
     pm.parent(transform_node, offset_transform)
     return offset_transform
 
@@ -409,16 +417,19 @@ def center_offset(transform_node: pm.nt.Transform):
     
     original_matrix = transform_node.getMatrix(worldSpace=True)
     offset_transform.setMatrix(original_matrix, worldSpace=True)
-    transform_node.setMatrix(original_matrix, worldSpace=True)
+    transform_node.setMatrix(pm.datatypes.Matrix(), objectSpace=True)  # Identity keeps the original world pose.
 
 ####################################################################################################################################
 #  PIVOT FUNCTIONS #################################################################################################################
 ####################################################################################################################################
 def bake_pivot(transform_node: pm.nt.Transform):
-    selection = pm.selected()
-    pm.select(transform_node)
+    selection = cmds.ls(sl=True, long=True)
+    cmds.select(str(transform_node), replace=True)
     pm.mel.eval("BakeCustomPivot;")
-    pm.select(selection)
+    if selection:
+        cmds.select(selection, replace=True)
+    else:
+        cmds.select(clear=True)
 
 def set_center_pivot(transform_node: pm.nt.Transform):
     center_point = get_center_pivot(transform_node)
@@ -426,9 +437,43 @@ def set_center_pivot(transform_node: pm.nt.Transform):
 
 def get_center_pivot(transform_node: pm.nt.Transform) -> pm.datatypes.Vector:
     """Get the center pivot point of the given transform node."""
-    bbox = transform_node.getBoundingBox(space='world')
-    center_point = bbox.center()
-    return center_point
+    return pm.datatypes.Vector(get_center_pivots([transform_node])[0].tolist())
+
+def get_components_center(components: list[pm.Component]) -> pm.datatypes.Vector:
+    """Get the world bounding box center of the given components, the same point a cluster on them pivots on."""
+    points = np.array(cmds.xform([str(component) for component in components], q=True, t=True, ws=True)).reshape(-1, 3)
+    center_point = (points.min(axis=0) + points.max(axis=0)) / 2.0
+    return pm.datatypes.Vector(center_point.tolist())
+
+def get_center_pivots(transform_nodes: list[pm.nt.Transform]) -> np.ndarray:
+    """Get the world center pivot point of every given transform node in one vectorized pass.
+    Returns:
+        np.ndarray: (N, 3) array with the center of each node's world bounding box.
+    """
+    if not transform_nodes:
+        return np.empty((0, 3))
+
+    # The selection list drops repeated nodes, so the lookup runs on unique nodes and maps back afterwards.
+    node_indices = {}
+    for transform_node in transform_nodes:
+        node_indices.setdefault(transform_node, len(node_indices))
+    unique_nodes = list(node_indices)
+    bounds = []
+    matrices = []
+    for dag_path in common.get_dag_paths(unique_nodes):
+        # A transform's bounding box already includes its own matrix, only the parents are left to apply.
+        bbox = om.MFnDagNode(dag_path).boundingBox
+        bounds.append([list(bbox.min)[:3], list(bbox.max)[:3]])
+        matrices.append(list(dag_path.exclusiveMatrix()))
+    bounds = np.array(bounds)
+    matrices = np.array(matrices).reshape(-1, 4, 4)
+
+    # Expand min/max into the 8 corners and move them to world space (row vectors).
+    corners = np.where(_BOX_CORNERS, bounds[:, 1:2, :], bounds[:, 0:1, :])
+    corners = np.concatenate([corners, np.ones(corners.shape[:2] + (1,))], axis=2)
+    world_corners = np.einsum("nki,nij->nkj", corners, matrices)[..., :3]
+    centers = 0.5 * (world_corners.min(axis=1) + world_corners.max(axis=1))
+    return centers[[node_indices[transform_node] for transform_node in transform_nodes]]
 
 ####################################################################################################################################
 #  VISIBILITY FUNCTIONS ############################################################################################################
@@ -500,9 +545,16 @@ def decrease_joint_radius(joint_node: pm.nt.Joint, decrement=1):
 #  HIERARCHY FUNCTIONS #############################################################################################################
 ####################################################################################################################################
 def build_hierarchy_from_list(transform_list: list[pm.nt.Transform]) -> pm.nt.Transform:
-    """Build a parent-child hierarchy following the list order."""
-    for i in range(1, len(transform_list)):
-        pm.parent(transform_list[i], transform_list[i-1])
+    """Build a parent-child hierarchy following the list order.
+       Run it inside an undo chunk (e.g. common.undo_chunk) so the whole chain undoes in one step.
+    """
+    # UUIDs survive the reparenting, so every link resolves its current full paths without wrapping PyNodes.
+    uuids = [cmds.ls(str(transform_node), uuid=True)[0] for transform_node in transform_list]
+    for parent_uuid, child_uuid in zip(uuids, uuids[1:]):
+        parent_path = cmds.ls(parent_uuid, long=True)[0]
+        child_path = cmds.ls(child_uuid, long=True)[0]
+        if (cmds.listRelatives(child_path, parent=True, fullPath=True) or [None])[0] != parent_path:
+            cmds.parent(child_path, parent_path)
     return transform_list[0]
 
 def is_ancestor(ancestor_transform: pm.nt.Transform, descendant_transform: pm.nt.Transform) -> bool:
@@ -511,22 +563,43 @@ def is_ancestor(ancestor_transform: pm.nt.Transform, descendant_transform: pm.nt
         return False
     if not isinstance(ancestor_transform, pm.nt.Transform) or not isinstance(descendant_transform, pm.nt.Transform):
         return False
-    ancestors = pm.nt.Transform(descendant_transform).getAllParents()
-    return ancestor_transform in ancestors
+    ancestor_path = common.get_dag_path(ancestor_transform).fullPathName()
+    descendant_path = common.get_dag_path(descendant_transform).fullPathName()
+    return descendant_path.startswith(ancestor_path + "|")
 
 def find_first_ancestor(transform_node: pm.nt.Transform, transform_list: list[pm.nt.Transform]) -> pm.nt.Transform:
-    parent_control = None
-    ancestors = list(filter(lambda x: is_ancestor(x, transform_node), transform_list))
-    if ancestors:
-        parent_reference = ancestors[-1]  # Closest ancestor in the selection.
-        parent_control = parent_reference
-    return parent_control
+    """Get the closest ancestor of the transform node inside the given list, or None."""
+    if not isinstance(transform_node, pm.nt.Transform):
+        return None
+    return find_first_ancestors([*transform_list, transform_node])[transform_node]
+
+def find_first_ancestors(transform_list: list[pm.nt.Transform]) -> dict:
+    """Map every transform in the list to its closest ancestor inside the same list, in a single pass.
+    Returns:
+        dict: {transform: closest ancestor in the list or None}
+    """
+    first_ancestors = dict.fromkeys(transform_list)
+    transforms = [node for node in first_ancestors if isinstance(node, pm.nt.Transform)]
+    dag_paths = common.get_dag_paths(transforms)
+    long_names = [dag_path.fullPathName() for dag_path in dag_paths]
+    transforms_by_path = dict(zip(long_names, transforms))
+
+    # Every ancestor's full path is a "|" prefix of the node's own, so the walk is string slicing only.
+    for long_name, transform_node in zip(long_names, transforms):
+        ancestor = None
+        separator = long_name.rfind("|")
+        while ancestor is None and separator > 0:
+            long_name = long_name[:separator]
+            ancestor = transforms_by_path.get(long_name)
+            separator = long_name.rfind("|")
+        first_ancestors[transform_node] = ancestor
+    return first_ancestors
 
 def has_children(transform_node: pm.nt.Transform) -> bool:
     # TODO: Check if the transform has non-shape nodes.
     """Check if the given transform node has children."""
-    children = transform_node.getChildren(type=pm.nt.Transform)
-    return len(children) > 0
+    dag_node = om.MFnDagNode(common.get_dag_path(transform_node))
+    return any(dag_node.child(index).hasFn(om.MFn.kTransform) for index in range(dag_node.childCount()))
 
 def create_hierarchy_from_dict(structure: dict, parent: pm.nt.Transform=None):
     """Creates a hierarchy from a Dictionary's keys.
@@ -542,12 +615,10 @@ def create_hierarchy_from_dict(structure: dict, parent: pm.nt.Transform=None):
 
 def sort_by_hierarchy(transform_list: list[pm.nt.Transform]) -> list[pm.nt.Transform]:
     """Sort a list of transform nodes by their hierarchy, parents first."""
-    updated_list = set(transform_list)
-
-    if updated_list:
-        updated_list = sorted(updated_list, key= lambda obj: obj.name(long=True))
-        return list(updated_list)
-    return []
+    unique_transforms = list(dict.fromkeys(transform_list))
+    dag_paths = common.get_dag_paths(unique_transforms)
+    long_names = [dag_path.fullPathName() for dag_path in dag_paths]
+    return [node for _, node in sorted(zip(long_names, unique_transforms), key=lambda pair: pair[0])]
 
 def subdivide_joint_hierarchy(start_joint:pm.nt.Transform, end_joint:pm.nt.Transform, quantity=1, name_suffix="_subdiv") -> list[pm.nt.Transform]:
     """Create joints between start_joint and end_joint.
@@ -1,16 +1,28 @@
 '''
 Content: Basic utility functions for mesh related nodes in Maya.
-Dependency: pymel.core, common
+Dependency: pymel.core, maya.cmds, maya.api.OpenMaya, numpy, importlib, re, common. Optional: trimesh, rtree
 Maya Version tested: 2024
 
 Author: Francisco Guzmán
 Email: francisco.guzmanga@gmail.com
 '''
 
+import importlib.util
+import re
+
+import maya.api.OpenMaya as om
+import maya.cmds as cmds
+import numpy as np
 import pymel.core as pm
 import chisel_rigging.utility.common as common
 import chisel_rigging.utility.mesh_lib as mesh_lib
 
+# Optional, batches the closest point queries of check_symmetry. Imported on first use to keep module load light.
+# trimesh's closest point query builds an R-tree, so it also needs rtree installed.
+HAS_TRIMESH = all(importlib.util.find_spec(module) is not None for module in ("trimesh", "rtree"))
+
+_EDGE_INDEX_PATTERN = re.compile(r"\.e\[(\d+)(?::(\d+))?\]")
+
 ####################################################################################################################################
 # Mesh Interaction Functions #######################################################################################################
 ####################################################################################################################################
@@ -45,66 +57,91 @@ def rebuild_surface(surface_transform:pm.nt.Transform):
 ####################################################################################################################################
 
 
+def _get_mesh_shape(mesh_transform: pm.nt.Transform) -> pm.nt.Mesh:
+    """Get the mesh shape of the given transform in a single lookup, None if it isn't a mesh."""
+    shape = common.get_shape(mesh_transform)
+    return shape if isinstance(shape, pm.nt.Mesh) else None
+
 def get_uv_sets(mesh_transform: pm.nt.Transform) -> list[str]:
-    if not common.is_mesh(mesh_transform): return []
-    
-    mesh = mesh_transform.getShape()
+    mesh = _get_mesh_shape(mesh_transform)
+    if mesh is None: return []
     return mesh.getUVSetNames()
 
 def rename_uv_set(mesh_transform: pm.nt.Transform, old_name: str, new_name: str):
-    if not common.is_mesh(mesh_transform): return None
-    mesh = mesh_transform.getShape()
+    mesh = _get_mesh_shape(mesh_transform)
+    if mesh is None: return None
     mesh.renameUVSet(old_name, new_name)
 
 def get_empty_uv_sets(mesh_transform: pm.nt.Transform) -> list[str]:
-    if not common.is_mesh(mesh_transform): return []
+    mesh = _get_mesh_shape(mesh_transform)
+    if mesh is None: return []
     
-    mesh = mesh_transform.getShape()
     uv_sets = mesh.getUVSetNames()
-    empty_uv_sets = []
-    for uv_set in uv_sets:
-        u_array, v_array = mesh.getUVs(uvSet=uv_set)
-        if len(u_array) == 0 and len(v_array) == 0:
-            empty_uv_sets.append(uv_set)
+    empty_uv_sets = [uv_set for uv_set in uv_sets if mesh.numUVs(uvSet=uv_set) == 0]
     return empty_uv_sets
 
 def delete_uv_set(mesh_transform: pm.nt.Transform, uv_set_name: str):
-    if not common.is_mesh(mesh_transform): return None
-    mesh = mesh_transform.getShape()
+    mesh = _get_mesh_shape(mesh_transform)
+    if mesh is None: return None
     mesh.deleteUVSet(uv_set_name)
 
 def delete_empty_uv_sets(mesh_transform: pm.nt.Transform):
-    if not common.is_mesh(mesh_transform): return None
+    mesh = _get_mesh_shape(mesh_transform)
+    if mesh is None: return None
     
-    empty_uv_sets = get_empty_uv_sets(mesh_transform)
-    mesh = mesh_transform.getShape()
-    for uv_set in empty_uv_sets:
-        mesh.deleteUVSet(uv_set)
+    empty_uv_sets = [uv_set for uv_set in mesh.getUVSetNames() if mesh.numUVs(uvSet=uv_set) == 0]
+    if not empty_uv_sets: return None
+    with pm.UndoChunk("deleteEmptyUVSets"):
+        for uv_set in empty_uv_sets:
+            mesh.deleteUVSet(uv_set)
 
 
 def check_symmetry(mesh: pm.nt.Mesh, axis="x", tolerance=0.001) -> bool:
     """Check for simmetry in the given mesh along the specified axis."""
-    vertices = mesh.vtx
-    asymmetric_vertices = []
-    for vtx in vertices:
-        pos = pm.xform(vtx, q=True, ws=True, t=True)
-        mirrored_pos = list(pos)
-        axis_index = {"x": 0, "y": 1, "z": 2}
-        mirrored_pos[axis_index[axis]] *= -1
-
-        closest_point = mesh.getClosestPoint(pm.datatypes.Vector(mirrored_pos), space='world')
-        distance = pm.datatypes.Vector(pos).distanceTo(closest_point)
-
-        if distance > tolerance:
-            asymmetric_vertices.append(vtx)
-    return asymmetric_vertices
-
-def check_non_manifold_geometry(mesh_transform: pm.nt.Transform) -> list[pm.MeshEdge]:
-    """Check for non-manifold edges in the given mesh."""
-    if not common.is_mesh(mesh_transform): return []
-    mesh = mesh_transform.getShape()
-    non_manifold_edges = mesh.getNonManifoldEdges()
-    return non_manifold_edges
+    axis_index = common.AXIS_INDEX[axis]
+    positions = np.array([list(point) for point in mesh.getPoints(space="world")])
+    mirrored_positions = positions.copy()
+    mirrored_positions[:, axis_index] *= -1
+
+    if HAS_TRIMESH:
+        closest_points = _get_closest_points_trimesh(mesh, positions, mirrored_positions)
+    else:
+        closest_points = np.array([list(mesh.getClosestPoint(pm.datatypes.Point(*point), space="world")[0])
+                                   for point in mirrored_positions])
+    asymmetric_indices = _get_asymmetric_indices(positions, closest_points, tolerance)
+    return [mesh.vtx[int(index)] for index in asymmetric_indices]
+
+def _get_closest_points_trimesh(mesh: pm.nt.Mesh, positions: np.ndarray, query_points: np.ndarray) -> np.ndarray:
+    """Batch closest point queries against the triangulated mesh with trimesh's R-tree of triangles."""
+    import trimesh
+    _, triangle_vertices = om.MFnMesh(common.get_dag_path(mesh)).getTriangles()
+    triangles = np.array(triangle_vertices, dtype=np.int64).reshape(-1, 3)
+    triangle_mesh = trimesh.Trimesh(vertices=positions, faces=triangles, process=False)
+    closest_points, _, _ = trimesh.proximity.closest_point(triangle_mesh, query_points)
+    return closest_points
+
+def _get_asymmetric_indices(positions: np.ndarray, closest_points: np.ndarray, tolerance: float) -> np.ndarray:
+    """Indices of the positions farther than tolerance from their mirrored closest point."""
+    squared_distances = ((positions - closest_points) ** 2).sum(axis=1)
+    return np.flatnonzero(squared_distances > tolerance * tolerance)
+
+def check_non_manifold_geometry(mesh_transform: pm.nt.Transform, raw=False) -> list[pm.MeshEdge] | np.ndarray:
+    """Check for non-manifold edges in the given mesh.
+    Args:
+        mesh_transform: Mesh to check.
+        raw: Return a numpy array of edge ids instead of PyMEL edges. Defaults to False.
+    """
+    mesh = _get_mesh_shape(mesh_transform)
+    if mesh is None: return np.array([], dtype=np.int32) if raw else []
+    if not raw:
+        return mesh.getNonManifoldEdges()
+
+    # One native query, only the ids are parsed out of the returned "mesh.e[id]" or "mesh.e[start:end]" names.
+    edge_names = cmds.polyInfo(str(mesh), nonManifoldEdges=True) or []
+    edge_ids = []
+    for start, end in _EDGE_INDEX_PATTERN.findall(" ".join(edge_names)):
+        edge_ids.extend(range(int(start), int(end or start) + 1))
+    return np.array(edge_ids, dtype=np.int32)
 
 def check_n_gons(mesh_transform: pm.nt.Transform) -> list[pm.MeshFace]:
     """Check for n-gon faces in the given mesh."""
@@ -131,21 +168,26 @@ def check_zero_area_faces(mesh: pm.nt.Mesh, threshold=0.0001) -> list[pm.MeshFac
 # Intermediate Shape Functions #####################################################################################################
 ####################################################################################################################################
 
+def _get_intermediate_shape_names(mesh_transform: pm.nt.Transform) -> set[str]:
+    """Get the full path names of the intermediate shapes with two DAG queries."""
+    name = mesh_transform.longName()
+    all_shapes = set(cmds.listRelatives(name, shapes=True, fullPath=True) or [])
+    render_shapes = set(cmds.listRelatives(name, shapes=True, noIntermediate=True, fullPath=True) or [])
+    return all_shapes - render_shapes
+
 def get_intermediate_shapes(mesh_transform: pm.nt.Transform) -> list[pm.nt.Shape]:
     """Get all intermediate shapes from the given mesh."""
-    shapes = mesh_transform.getShapes()
-    intermediate_shapes = [shape for shape in shapes if shape.intermediateObject.get()]
-    return intermediate_shapes
+    return [pm.PyNode(name) for name in _get_intermediate_shape_names(mesh_transform)]
 
 def delete_intermediate_shapes(mesh_transform: pm.nt.Transform):
     """Delete all intermediate shapes from the given mesh."""
-    intermediate_shapes = get_intermediate_shapes(mesh_transform)
-    pm.delete(intermediate_shapes)
+    intermediate_shapes = _get_intermediate_shape_names(mesh_transform)
+    if intermediate_shapes:
+        cmds.delete(list(intermediate_shapes))
 
 def has_intermediate_shapes(mesh_transform: pm.nt.Transform) -> bool:
     """Check if the given mesh has intermediate shapes."""
-    intermediate_shapes = get_intermediate_shapes(mesh_transform)
-    return len(intermediate_shapes) > 0
+    return bool(_get_intermediate_shape_names(mesh_transform))
 
 ####################################################################################################################################
 # Deformer Utility Functions #######################################################################################################